@@ -1,12 +1,17 @@
-from flask import Flask, render_template, send_file, jsonify, request
+from flask import Flask, render_template, send_file, jsonify, request, Response
 import pandas as pd
 import os
 import time
 from src.inference import FlightPredictor
+from src import metrics
+from src.visualization import VisualizationService, normalize_params
+from src.rollups import RollupCube, DIMENSION_COLUMNS, NUMERIC_DIMENSIONS
 
 app = Flask(__name__)
+metrics.init_app(app)
 
-predictor = FlightPredictor()
+# float32, float16 or int8; pick from the quantization report in output/compact/model.json
+predictor = FlightPredictor(model_variant=os.environ.get('MODEL_VARIANT', 'float32'))
 
 class AirportDashboard:
     def __init__(self):
@@ -15,7 +20,9 @@ class AirportDashboard:
             'scorecard': None,
             'predictions': None,
             'last_updated': 0,
-            'cache_duration': 300
+            'cache_duration': 300,
+            'rollups': None,
+            'rollups_mtime': 0
         }
         
     def load_scorecard(self, force_reload=False):
@@ -23,12 +30,16 @@ class AirportDashboard:
         if (not force_reload and 
             self.cache['scorecard'] is not None and 
             (current_time - self.cache['last_updated']) < self.cache['cache_duration']):
+            metrics.registry.inc('cache_requests_total', cache='scorecard', result='hit')
             return self.cache['scorecard']
+        metrics.registry.inc('cache_requests_total', cache='scorecard', result='miss')
         
         try:
             file_path = f'{self.output_dir}airport_scorecard.csv'
             if os.path.exists(file_path):
+                load_start = time.perf_counter()
                 df = pd.read_csv(file_path)
+                metrics.registry.set('artifact_load_seconds', time.perf_counter() - load_start, artifact='scorecard')
                 self.cache['scorecard'] = df
                 self.cache['last_updated'] = current_time
                 return df
@@ -39,6 +50,27 @@ class AirportDashboard:
                 return self.cache['scorecard']
             return pd.DataFrame()
     
+    def load_rollups(self):
+        file_path = f'{self.output_dir}rollups.pkl'
+        if not os.path.exists(file_path):
+            return None
+
+        mtime = os.path.getmtime(file_path)
+        if self.cache['rollups'] is not None and mtime == self.cache['rollups_mtime']:
+            metrics.registry.inc('cache_requests_total', cache='rollups', result='hit')
+            return self.cache['rollups']
+        metrics.registry.inc('cache_requests_total', cache='rollups', result='miss')
+
+        try:
+            load_start = time.perf_counter()
+            cube = RollupCube.load(file_path)
+            metrics.registry.set('artifact_load_seconds', time.perf_counter() - load_start, artifact='rollups')
+            self.cache['rollups'] = cube
+            self.cache['rollups_mtime'] = mtime
+            return cube
+        except Exception as e:
+            return self.cache['rollups']
+
     def load_predictions(self):
         try:
             file_path = f'{self.output_dir}predictions.csv'
@@ -49,6 +81,7 @@ class AirportDashboard:
             return pd.DataFrame()
 
 dashboard = AirportDashboard()
+charts = VisualizationService(output_dir=dashboard.output_dir)
 
 @app.route('/')
 def home():
@@ -110,6 +143,51 @@ def get_predictions():
         'sample': df.head(100).to_dict('records')
     })
 
+@app.route('/api/rollups/dimensions')
+def get_rollup_dimensions():
+    cube = dashboard.load_rollups()
+    if cube is None:
+        return jsonify({"error": "Rollups not found. Run the prediction model first."})
+
+    values = {}
+    for dim in cube.dimensions:
+        table = cube.cuboids.get((dim,))
+        if table is not None:
+            values[dim] = sorted(table[dim].astype(int if dim in NUMERIC_DIMENSIONS else str).tolist())
+    return jsonify({'dimensions': list(cube.dimensions), 'values': values})
+
+@app.route('/api/rollups/query')
+def query_rollups():
+    cube = dashboard.load_rollups()
+    if cube is None:
+        return jsonify({"error": "Rollups not found. Run the prediction model first."})
+
+    try:
+        filters = {}
+        for dim in DIMENSION_COLUMNS:
+            value = request.args.get(dim)
+            if value:
+                filters[dim] = [v.strip() for v in value.split(',') if v.strip()]
+
+        group_by = [d.strip() for d in request.args.get('group_by', '').split(',') if d.strip()]
+        result = cube.query(
+            filters=filters,
+            group_by=group_by,
+            sort_by=request.args.get('sort', 'Score'),
+            ascending=request.args.get('order', 'asc') != 'desc',
+            limit=int(request.args.get('limit', 50)),
+            min_flights=int(request.args.get('min_flights', 10))
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        'filters': filters,
+        'group_by': group_by,
+        'total_rows': len(result),
+        'rows': result.to_dict('records')
+    })
+
 @app.route('/api/status')
 def get_status():
     file_exists = os.path.exists(f'{dashboard.output_dir}airport_scorecard.csv')
@@ -118,6 +196,10 @@ def get_status():
         'last_updated': dashboard.cache['last_updated']
     })
 
+@app.route('/metrics')
+def get_metrics():
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/download/scorecard')
 def download_scorecard():
     return send_file(f'{dashboard.output_dir}airport_scorecard.csv', as_attachment=True)
@@ -126,6 +208,31 @@ def download_scorecard():
 def show_visualization():
     return send_file(f'{dashboard.output_dir}scorecard_visualization.png')
 
+@app.route('/api/visualizations')
+def request_visualization():
+    try:
+        params = normalize_params(
+            airline=request.args.get('airline'),
+            airports=request.args.get('airports'),
+            dpi=request.args.get('dpi', 100)
+        )
+    except ValueError as e:
+        return jsonify({"error": f"Invalid parameters: {e}"}), 400
+
+    status, key, error = charts.request_chart(params)
+    if status == 'error':
+        return jsonify({"status": status, "error": error}), 422
+
+    body = {"status": status, "key": key, "url": f"/api/visualizations/{key}.png"}
+    return jsonify(body), 200 if status == 'ready' else 202
+
+@app.route('/api/visualizations/<key>.png')
+def get_visualization(key):
+    path = charts.chart_path(os.path.basename(key))
+    if not os.path.exists(path):
+        return jsonify({"error": "Chart not rendered yet."}), 404
+    return send_file(path, mimetype='image/png')
+
 if __name__ == '__main__':
     os.makedirs('output', exist_ok=True)
     os.makedirs('templates', exist_ok=True)
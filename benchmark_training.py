@@ -0,0 +1,121 @@
+import warnings
+warnings.filterwarnings('ignore')
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+# Compares the original training setup against CPU_FAST_CONFIG on the same
+# split, adding one change per run so each part (float32 inputs, large batch
+# with warmup, XLA, thread settings) can be judged on its own. Every run is a
+# separate process because TensorFlow's thread pools can only be set once.
+
+MAX_AUC_DROP = 0.005
+MAX_MAE_INCREASE = 0.5
+
+def build_runs(intra_op_threads, inter_op_threads):
+    from src.model import CPU_FAST_CONFIG
+    large_batch = dict(CPU_FAST_CONFIG, jit_compile=False)
+    return [
+        ('Baseline (float64)', {'batch_size': 256, 'dtype': 'float64'}, None),
+        ('+ float32', {'batch_size': 256}, None),
+        ('+ large batch', large_batch, None),
+        ('+ XLA', dict(large_batch, jit_compile=True), None),
+        ('+ threads', large_batch, (intra_op_threads, inter_op_threads)),
+        ('+ threads + XLA', dict(large_batch, jit_compile=True), (intra_op_threads, inter_op_threads))
+    ]
+
+def run_config(train_kwargs, threads, nrows, epochs):
+    import tensorflow as tf
+    from src import dataloader, preprocessing, features, evaluation
+    from src.model import FlightDelayModel, configure_cpu_threads
+
+    if threads:
+        configure_cpu_threads(*threads)
+
+    flights, _, _ = dataloader.load_data(nrows=nrows)
+    flights = preprocessing.preprocess_data(flights)
+    X, y_cls, y_reg, _, _ = features.engineer_features(flights)
+
+    split_idx = int(0.8 * len(X))
+    X_train, X_val = X[:split_idx], X[split_idx:]
+    y_cls_train, y_cls_val = y_cls[:split_idx], y_cls[split_idx:]
+    y_reg_train, y_reg_val = y_reg[:split_idx], y_reg[split_idx:]
+
+    train_kwargs = dict(train_kwargs)
+    if 'dtype' in train_kwargs:
+        train_kwargs['dtype'] = np.dtype(train_kwargs['dtype']).type
+
+    tf.keras.utils.set_random_seed(42)
+    model = FlightDelayModel(input_dim=X_train.shape[1])
+    start = time.time()
+    throughput = model.train(X_train, y_cls_train, y_reg_train, epochs=epochs, **train_kwargs)
+    train_time = time.time() - start
+
+    _, _, auc, mae = evaluation.evaluate_model(model, X_val, y_cls_val, y_reg_val)
+    return {
+        'train_rows': len(X_train),
+        'train_time': train_time,
+        'epochs': len(throughput),
+        # First epoch includes graph tracing/XLA compilation
+        'samples_per_sec': float(np.mean(throughput[1:] or throughput)),
+        'auc': float(auc),
+        'mae': float(mae)
+    }
+
+def main(nrows, epochs, intra_op_threads, inter_op_threads):
+    if not os.path.exists(os.path.join('data', 'flights.csv')):
+        print("Error: data/flights.csv not found")
+        return
+
+    results = []
+    for name, train_kwargs, threads in build_runs(intra_op_threads, inter_op_threads):
+        print(f"\n{'=' * 60}\n{name}: {train_kwargs} threads={threads or 'default'}\n{'=' * 60}")
+        spec = json.dumps({'train_kwargs': train_kwargs, 'threads': threads})
+        proc = subprocess.run(
+            [sys.executable, __file__, '--run', spec, '--nrows', str(nrows), '--epochs', str(epochs)],
+            stdout=subprocess.PIPE, text=True
+        )
+        if proc.returncode != 0:
+            print(f"{name} failed (exit code {proc.returncode})")
+            return
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result['name'] = name
+        results.append(result)
+        print(f"{result['train_time']:.1f}s | {result['samples_per_sec']:,.0f} samples/sec")
+
+    baseline = results[0]
+    print(f"\n{'=' * 60}\nTRAINING BENCHMARK ({baseline['train_rows']:,} training rows, "
+          f"parity: AUC drop <= {MAX_AUC_DROP}, MAE increase <= {MAX_MAE_INCREASE})\n{'=' * 60}")
+    for r in results:
+        parity = (baseline['auc'] - r['auc'] <= MAX_AUC_DROP and
+                  r['mae'] - baseline['mae'] <= MAX_MAE_INCREASE)
+        print(f"{r['name']:>20}: {r['train_time']:7.1f}s / {r['epochs']:2d} epochs | "
+              f"{r['samples_per_sec']:>10,.0f} samples/sec "
+              f"({r['samples_per_sec'] / baseline['samples_per_sec']:.2f}x) | "
+              f"AUC {r['auc']:.4f} ({r['auc'] - baseline['auc']:+.4f}) | "
+              f"MAE {r['mae']:.2f} ({r['mae'] - baseline['mae']:+.2f}) | "
+              f"{'PASS' if parity else 'FAIL'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nrows', type=int, default=1_000_000)
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--intra-op-threads', type=int, default=os.cpu_count())
+    parser.add_argument('--inter-op-threads', type=int, default=2)
+    parser.add_argument('--run', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        # Child process: training logs go to stderr, the JSON result is the last stdout line
+        spec = json.loads(args.run)
+        stdout = sys.stdout
+        sys.stdout = sys.stderr
+        result = run_config(spec['train_kwargs'], spec['threads'], args.nrows, args.epochs)
+        sys.stdout = stdout
+        print(json.dumps(result))
+    else:
+        main(args.nrows, args.epochs, args.intra_op_threads, args.inter_op_threads)
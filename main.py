@@ -2,14 +2,16 @@ import warnings
 warnings.filterwarnings('ignore')
 import time
 import os
+import argparse
 import joblib  
 import pandas as pd
 
-from src import dataloader, preprocessing, features, evaluation, scorecard
-from src.model import FlightDelayModel
+from src import dataloader, preprocessing, features, evaluation, scorecard, rollups
+from src.model import FlightDelayModel, CPU_FAST_CONFIG, configure_cpu_threads
 
-def main():
+def main(fast_train=False, intra_op_threads=None, inter_op_threads=None, xla=False):
     total_start = time.time()
+    configure_cpu_threads(intra_op_threads, inter_op_threads)
     print("=" * 60)
     print("FLIGHT DELAY PREDICTION & AIRPORT SCORECARD SYSTEM")
     print("=" * 60)
@@ -27,13 +29,14 @@ def main():
         print(f"Time: {time.time() - start_time:.1f} seconds")
 
         start_time = time.time()
-        X, y_cls, y_reg, airports_data = features.engineer_features(flights)
+        X, y_cls, y_reg, airports_data, dimensions = features.engineer_features(flights)
         
         print("Saving metadata for inference...")
         airline_mapping = {airline: i for i, airline in enumerate(flights['AIRLINE'].unique())}
         metadata = {
             'airline_mapping': airline_mapping,
-            'input_dim': X.shape[1]
+            'input_dim': X.shape[1],
+            'feature_cols': features.FEATURE_COLS
         }
         os.makedirs('output', exist_ok=True)
         joblib.dump(metadata, 'output/metadata.pkl')
@@ -49,12 +52,18 @@ def main():
         y_cls_train, y_cls_val = y_cls[:split_idx], y_cls[split_idx:]
         y_reg_train, y_reg_val = y_reg[:split_idx], y_reg[split_idx:]
         airports_train, airports_val = airports_data[:split_idx], airports_data[split_idx:]
+        dimensions_val = dimensions.iloc[split_idx:].reset_index(drop=True)
         
         print(f"Training on {len(X_train):,} samples")
         print(f"Validating on {len(X_val):,} samples")
 
         model = FlightDelayModel(input_dim=X.shape[1])
-        model.train(X_train, y_cls_train, y_reg_train, epochs=20, batch_size=256)
+        if fast_train:
+            train_config = dict(CPU_FAST_CONFIG, jit_compile=xla)
+            print(f"CPU fast training mode: {train_config}")
+            model.train(X_train, y_cls_train, y_reg_train, epochs=20, **train_config)
+        else:
+            model.train(X_train, y_cls_train, y_reg_train, epochs=20, batch_size=256)
         print(f"Time: {time.time() - train_start:.1f} seconds")
 
         
@@ -64,7 +73,8 @@ def main():
 
         start_time = time.time()
         
-        model.save('output/flight_delay_model.h5')
+        model.save('output/flight_delay_model.h5', feature_spec=metadata,
+                   eval_data=(X_val, y_cls_val, y_reg_val))
         print(f"Saved model to output/flight_delay_model.h5")
 
         scorecard_df = scorecard.create_scorecard_dataframe(
@@ -77,6 +87,10 @@ def main():
 
         predictions_df = pd.DataFrame({
             'Airport': airports_val,
+            'Destination': dimensions_val['Destination'],
+            'Airline': dimensions_val['Airline'],
+            'Hour': dimensions_val['Hour'],
+            'Day_Of_Week': dimensions_val['Day_Of_Week'],
             'True_Significant_Delay': y_cls_val,
             'Pred_Significant_Delay_Prob': cls_preds,
             'True_Total_Delay': y_reg_val,
@@ -85,6 +99,10 @@ def main():
         predictions_df.to_csv('output/predictions.csv', index=False)
         print(f"Saved predictions for {len(predictions_df)} flights")
 
+        cube = rollups.RollupCube.build(predictions_df)
+        cube.save('output/rollups.pkl')
+        print(f"Saved {len(cube.cuboids)} rollup tables ({cube.total_rows():,} rows) to output/rollups.pkl")
+
         scorecard.save_summary(
             scorecard_df, auc, mae, len(flights), X.shape[0], 'output'
         )
@@ -106,4 +124,12 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fast-train', action='store_true',
+                        help='Large-batch, XLA-compiled training for CPU-only hosts')
+    parser.add_argument('--xla', action='store_true',
+                        help='XLA-compile the train step in --fast-train mode')
+    parser.add_argument('--intra-op-threads', type=int, default=None)
+    parser.add_argument('--inter-op-threads', type=int, default=None)
+    args = parser.parse_args()
+    main(args.fast_train, args.intra_op_threads, args.inter_op_threads, xla=args.xla)
\ No newline at end of file
@@ -0,0 +1,137 @@
+import json
+import os
+import numpy as np
+
+# Framework-free copy of the trained network: a JSON header (topology, feature
+# spec, tensor offsets) plus one flat weights file per precision variant that
+# gets memory-mapped on load. Nothing in here imports TensorFlow.
+
+ARTIFACT_VERSION = 2
+HEADER_FILE = 'model.json'
+# Every tensor starts on this boundary so float32 tensors can be used as
+# zero-copy views into the memmap
+ALIGNMENT = 8
+VARIANTS = ('float32', 'float16', 'int8')
+
+ACTIVATIONS = {
+    'relu': lambda x: np.maximum(x, 0),
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-np.clip(x, -60, 60))),
+    'linear': lambda x: x,
+}
+
+def _weights_file(variant):
+    return f'weights_{variant}.bin'
+
+def _quantize(array, variant):
+    array = np.asarray(array, dtype=np.float32)
+    if variant == 'float32':
+        return array, None
+    if variant == 'float16':
+        return array.astype(np.float16), None
+    if variant == 'int8':
+        # One scale per kernel row (input feature): inputs are unscaled, so the
+        # 'distance' row holds weights orders of magnitude smaller than the
+        # sin/cos rows and a shared scale would round it away
+        rows = array.reshape(array.shape[0], -1) if array.ndim > 1 else array.reshape(1, -1)
+        max_abs = np.max(np.abs(rows), axis=1) if rows.size else np.zeros(len(rows), dtype=np.float32)
+        scale = np.where(max_abs > 0, max_abs / 127, 1.0).astype(np.float32)
+        quantized = np.clip(np.round(rows / scale[:, None]), -127, 127).astype(np.int8)
+        return quantized.reshape(array.shape), scale.tolist()
+    raise ValueError(f"Unknown artifact variant: {variant}")
+
+def write_artifact(layers, outputs, feature_spec, path, variants=VARIANTS):
+    """layers: ordered dicts with name, activation, inputs, kernel, bias."""
+    os.makedirs(path, exist_ok=True)
+
+    header = {
+        'version': ARTIFACT_VERSION,
+        'feature_spec': feature_spec,
+        'outputs': list(outputs),
+        'layers': [
+            {'name': l['name'], 'activation': l['activation'], 'inputs': l['inputs']}
+            for l in layers
+        ],
+        'variants': {},
+    }
+
+    for variant in variants:
+        tensors = {}
+        offset = 0
+        with open(os.path.join(path, _weights_file(variant)), 'wb') as f:
+            for layer in layers:
+                for kind in ('kernel', 'bias'):
+                    # Biases are tiny, so int8 only quantizes the kernels
+                    stored_variant = 'float32' if variant == 'int8' and kind == 'bias' else variant
+                    data, scale = _quantize(layer[kind], stored_variant)
+                    data = np.ascontiguousarray(data)
+                    padding = -offset % ALIGNMENT
+                    f.write(b'\0' * padding)
+                    offset += padding
+                    f.write(data.tobytes())
+                    tensors[f"{layer['name']}/{kind}"] = {
+                        'dtype': data.dtype.name,
+                        'shape': list(data.shape),
+                        'offset': offset,
+                        'scale': scale,
+                    }
+                    offset += data.nbytes
+        header['variants'][variant] = {'file': _weights_file(variant), 'bytes': offset, 'tensors': tensors}
+
+    with open(os.path.join(path, HEADER_FILE), 'w') as f:
+        json.dump(header, f, indent=2)
+
+    return header
+
+def update_header(path, **fields):
+    header_path = os.path.join(path, HEADER_FILE)
+    with open(header_path) as f:
+        header = json.load(f)
+    header.update(fields)
+    with open(header_path, 'w') as f:
+        json.dump(header, f, indent=2)
+
+def artifact_exists(path):
+    return os.path.exists(os.path.join(path, HEADER_FILE))
+
+class CompactModel:
+    def __init__(self, path, variant='float32', fallback_variant=None):
+        with open(os.path.join(path, HEADER_FILE)) as f:
+            self.header = json.load(f)
+
+        if self.header.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported artifact version: {self.header.get('version')}")
+        if variant not in self.header['variants']:
+            if fallback_variant not in self.header['variants']:
+                raise ValueError(f"Artifact at {path} has no '{variant}' variant")
+            print(f"Artifact at {path} has no '{variant}' variant, using '{fallback_variant}'")
+            variant = fallback_variant
+
+        self.variant = variant
+        self.feature_spec = self.header['feature_spec']
+        self.outputs = self.header['outputs']
+        self.layers = self.header['layers']
+
+        spec = self.header['variants'][variant]
+        raw = np.memmap(os.path.join(path, spec['file']), dtype=np.uint8, mode='r')
+
+        # float32 tensors stay read-only views into the memmap; float16/int8
+        # ones are dequantized to float32 once, which copies
+        self.weights = {}
+        for key, t in spec['tensors'].items():
+            dtype = np.dtype(t['dtype'])
+            count = int(np.prod(t['shape'])) if t['shape'] else 1
+            arr = np.frombuffer(raw, dtype=dtype, count=count, offset=t['offset']).reshape(t['shape'])
+            if dtype != np.float32:
+                arr = arr.astype(np.float32)
+            if t['scale'] is not None:
+                scale = np.asarray(t['scale'], dtype=np.float32)
+                arr *= scale.reshape((-1,) + (1,) * (arr.ndim - 1))
+            self.weights[key] = arr
+
+    def predict(self, X):
+        values = {'input': np.asarray(X, dtype=np.float32)}
+        for layer in self.layers:
+            x = values[layer['inputs']]
+            z = x @ self.weights[f"{layer['name']}/kernel"] + self.weights[f"{layer['name']}/bias"]
+            values[layer['name']] = ACTIVATIONS[layer['activation']](z)
+        return [values[name] for name in self.outputs]
@@ -2,12 +2,22 @@ import pandas as pd
 import numpy as np
 from src.mappings import get_airport_code  
 
+FEATURE_COLS = [
+    'dep_hour_sin', 'dep_hour_cos',
+    'day_of_week_sin', 'day_of_week_cos',
+    'month_sin', 'month_cos',
+    'is_weekend',
+    'airline_encoded',
+    'distance'
+]
+
 def engineer_features(flights):
     print(f"\n[3/6] Engineering features...")
     print("Mapping numeric airport IDs to 3-letter codes...")
     flights['origin_airport'] = flights['ORIGIN_AIRPORT'].apply(get_airport_code)
     
     flights = flights.dropna(subset=['origin_airport'])
+    flights['destination_airport'] = flights['DESTINATION_AIRPORT'].apply(get_airport_code).fillna('UNK')
     
     print(f"Kept {len(flights):,} flights after mapping")
     
@@ -28,23 +38,23 @@ def engineer_features(flights):
 
     flights['distance'] = flights['DISTANCE'].fillna(flights['DISTANCE'].median())
 
-    feature_cols = [
-        'dep_hour_sin', 'dep_hour_cos',
-        'day_of_week_sin', 'day_of_week_cos',
-        'month_sin', 'month_cos',
-        'is_weekend',
-        'airline_encoded',
-        'distance'
-    ]
+    feature_cols = FEATURE_COLS
 
-    flights_clean = flights[feature_cols + ['significant_delay', 'total_delay', 'origin_airport']].dropna()
+    dimension_cols = ['destination_airport', 'AIRLINE', 'dep_hour', 'DAY_OF_WEEK']
+    flights_clean = flights[feature_cols + ['significant_delay', 'total_delay', 'origin_airport'] + dimension_cols].dropna()
 
-    X = flights_clean[feature_cols].values
+    X = flights_clean[feature_cols].values.astype(np.float32)
     y_cls = flights_clean['significant_delay'].values
     y_reg = flights_clean['total_delay'].values
     airports_data = flights_clean['origin_airport'].values
+    dimensions = pd.DataFrame({
+        'Destination': flights_clean['destination_airport'].values,
+        'Airline': flights_clean['AIRLINE'].values,
+        'Hour': flights_clean['dep_hour'].values,
+        'Day_Of_Week': flights_clean['DAY_OF_WEEK'].values
+    })
 
     print(f"Features: {X.shape[1]}, Samples: {X.shape[0]:,}")
     print(f"Unique airports: {len(np.unique(airports_data))}")
 
-    return X, y_cls, y_reg, airports_data
\ No newline at end of file
+    return X, y_cls, y_reg, airports_data, dimensions
\ No newline at end of file
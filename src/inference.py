@@ -1,14 +1,17 @@
 import numpy as np
 import joblib
 import os
+import time
 import pandas as pd
 from math import radians, cos, sin, asin, sqrt
-from src.model import FlightDelayModel
+from src.artifact import CompactModel, artifact_exists
+from src.metrics import registry
 
 class FlightPredictor:
-    def __init__(self, model_dir='output', data_dir='data'):
+    def __init__(self, model_dir='output', data_dir='data', model_variant='float32'):
         self.model_dir = model_dir
         self.data_dir = data_dir
+        self.model_variant = model_variant
         self.model = None
         self.metadata = None
         self.airport_coords = {}
@@ -25,17 +28,27 @@ class FlightPredictor:
 
     def load(self):
         try:
-            meta_path = os.path.join(self.model_dir, 'metadata.pkl')
-            if not os.path.exists(meta_path):
-                return False
-            self.metadata = joblib.load(meta_path)
-            
-            self.model = FlightDelayModel(input_dim=self.metadata['input_dim'])
-            model_path = os.path.join(self.model_dir, 'flight_delay_model.h5')
-            if not os.path.exists(model_path):
-                return False
-            self.model.load(model_path)
-            
+            load_start = time.perf_counter()
+            compact_path = os.path.join(self.model_dir, 'compact')
+            if artifact_exists(compact_path):
+                # Compact artifact carries its own feature spec and needs no TensorFlow
+                self.model = CompactModel(compact_path, self.model_variant, fallback_variant='float32')
+                self.metadata = self.model.feature_spec
+            else:
+                meta_path = os.path.join(self.model_dir, 'metadata.pkl')
+                if not os.path.exists(meta_path):
+                    return False
+                self.metadata = joblib.load(meta_path)
+
+                from src.model import FlightDelayModel
+                self.model = FlightDelayModel(input_dim=self.metadata['input_dim'])
+                model_path = os.path.join(self.model_dir, 'flight_delay_model.h5')
+                if not os.path.exists(model_path):
+                    return False
+                self.model.load(model_path)
+            registry.set('artifact_load_seconds', time.perf_counter() - load_start, artifact='model')
+
+            load_start = time.perf_counter()
             airports_path = os.path.join(self.data_dir, 'airports.csv')
             if os.path.exists(airports_path):
                 df = pd.read_csv(airports_path)
@@ -44,6 +57,7 @@ class FlightPredictor:
                         'lat': float(row['LATITUDE']), 
                         'lon': float(row['LONGITUDE'])
                     }
+                registry.set('artifact_load_seconds', time.perf_counter() - load_start, artifact='airports')
             self.loaded = True
             return True
         except Exception as e:
@@ -56,6 +70,7 @@ class FlightPredictor:
                 return {"error": "Model not trained yet."}
 
         try:
+            build_start = time.perf_counter()
             origin = str(data.get('ORIGIN_AIRPORT', '')).strip().upper()
             dest = str(data.get('DESTINATION_AIRPORT', '')).strip().upper()
 
@@ -90,12 +105,15 @@ class FlightPredictor:
                 is_weekend,
                 airline_encoded,
                 distance
-            ]])
+            ]], dtype=np.float32)
 
+            call_start = time.perf_counter()
+            registry.observe('prediction_feature_build_seconds', call_start - build_start)
             preds = self.model.predict(features)
+            registry.observe('prediction_model_call_seconds', time.perf_counter() - call_start)
             
-            prob_delay = float(preds[0][0])
-            raw_delay_pred = float(preds[1][0])
+            prob_delay = float(np.ravel(preds[0])[0])
+            raw_delay_pred = float(np.ravel(preds[1])[0])
             
             if raw_delay_pred < 1:
                 est_delay = prob_delay * 50
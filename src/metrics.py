@@ -0,0 +1,158 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# In-process metrics rendered in Prometheus text format. Recording is a dict
+# lookup and a few integer increments under one lock, so it is cheap enough
+# for the request path; all formatting and quantile math happens at scrape time.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket, same as PromQL histogram_quantile
+        if self.count == 0:
+            return float('nan')
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n > 0:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.definitions = {}
+        self.values = {}
+
+    def define(self, name, kind, help_text):
+        self.definitions[name] = (kind, help_text)
+        self.values.setdefault(name, {})
+
+    def inc(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.values[name]
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[name][key] = value
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.values[name]
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (kind, help_text) in self.definitions.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in self.values[name].items():
+                    if kind == 'histogram':
+                        lines.extend(self._render_histogram(name, key, value))
+                    else:
+                        lines.append(f"{name}{_format_labels(key)} {value}")
+                if kind == 'histogram':
+                    # Precomputed quantiles so dashboards don't need PromQL
+                    lines.append(f"# HELP {name}_quantile {help_text} (bucket-interpolated quantiles)")
+                    lines.append(f"# TYPE {name}_quantile gauge")
+                    for key, hist in self.values[name].items():
+                        for q in QUANTILES:
+                            labels = _format_labels(key + (('quantile', str(q)),))
+                            lines.append(f"{name}_quantile{labels} {hist.quantile(q)}")
+        return "\n".join(lines) + "\n"
+
+    def _render_histogram(self, name, key, hist):
+        lines = []
+        cumulative = 0
+        for bound, n in zip(hist.buckets, hist.counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{_format_labels(key + (('le', str(bound)),))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {hist.count}")
+        lines.append(f"{name}_sum{_format_labels(key)} {hist.sum}")
+        lines.append(f"{name}_count{_format_labels(key)} {hist.count}")
+        return lines
+
+def _format_labels(key):
+    if not key:
+        return ''
+    parts = []
+    for k, v in key:
+        v = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{k}="{v}"')
+    return '{' + ','.join(parts) + '}'
+
+registry = MetricsRegistry()
+registry.define('http_request_duration_seconds', 'histogram', 'HTTP request latency by route')
+registry.define('http_requests_total', 'counter', 'HTTP requests by route, method and status')
+registry.define('http_request_errors_total', 'counter', 'HTTP requests that returned 5xx or raised')
+registry.define('prediction_feature_build_seconds', 'histogram', 'FlightPredictor feature construction time')
+registry.define('prediction_model_call_seconds', 'histogram', 'FlightPredictor model forward pass time')
+registry.define('artifact_load_seconds', 'gauge', 'Duration of the most recent load of each artifact')
+registry.define('cache_requests_total', 'counter', 'Dashboard cache lookups by cache and result')
+
+def init_app(app):
+    from flask import request, g
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            registry.observe('http_request_duration_seconds', time.perf_counter() - start, route=route)
+            registry.inc('http_requests_total', route=route, method=request.method, status=response.status_code)
+            if response.status_code >= 500:
+                registry.inc('http_request_errors_total', route=route)
+        return response
+
+    @app.teardown_request
+    def _record_exception(exc):
+        # Normally an unhandled exception still reaches after_request with the
+        # 500 response (via handle_exception -> finalize_request), which pops
+        # the timer. Only with PROPAGATE_EXCEPTIONS (debug/testing) is
+        # after_request skipped, and this records the request instead. The
+        # g.pop in both hooks keeps each request counted once.
+        start = g.pop('_metrics_start', None)
+        if exc is not None and start is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            registry.observe('http_request_duration_seconds', time.perf_counter() - start, route=route)
+            registry.inc('http_requests_total', route=route, method=request.method, status=500)
+            registry.inc('http_request_errors_total', route=route)
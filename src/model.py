@@ -1,5 +1,76 @@
+import os
+import math
+import time
+import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, Model, models
+from sklearn.metrics import roc_auc_score, mean_absolute_error
+from src import artifact
+
+OUTPUT_NAMES = ('classification', 'regression')
+BASE_LEARNING_RATE = 0.001
+BASE_BATCH_SIZE = 256
+
+# Settings for CPU-only hosts: large batches keep every core busy and the learning
+# rate is scaled up with a warmup to compensate. XLA is opt-in (--xla) until
+# benchmark_training.py shows parity on the real dataset.
+CPU_FAST_CONFIG = {
+    'batch_size': 2048,
+    'warmup_epochs': 2,
+    'jit_compile': False
+}
+
+def configure_cpu_threads(intra_op_threads=None, inter_op_threads=None):
+    # Must run before TensorFlow executes its first op
+    if intra_op_threads:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    if inter_op_threads:
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+def scaled_learning_rate(batch_size):
+    # Linear scaling; with the 2-epoch warmup it kept AUC/MAE at parity in
+    # benchmark_training.py, while sqrt scaling under-trained in 20 epochs
+    return BASE_LEARNING_RATE * batch_size / BASE_BATCH_SIZE
+
+class WarmupSchedule(tf.keras.optimizers.schedules.LearningRateSchedule):
+    def __init__(self, target_lr, warmup_steps):
+        self.target_lr = target_lr
+        self.warmup_steps = warmup_steps
+
+    def __call__(self, step):
+        step = tf.cast(step, tf.float32)
+        warmup = tf.cast(max(self.warmup_steps, 1), tf.float32)
+        return self.target_lr * tf.minimum(1.0, (step + 1) / warmup)
+
+    def get_config(self):
+        return {'target_lr': self.target_lr, 'warmup_steps': self.warmup_steps}
+
+class ThroughputLogger(tf.keras.callbacks.Callback):
+    def __init__(self, samples_per_epoch):
+        super().__init__()
+        self.samples_per_epoch = samples_per_epoch
+        self.epoch_start = None
+        self.train_elapsed = None
+        self.history = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start = time.perf_counter()
+        self.train_elapsed = None
+
+    def on_test_begin(self, logs=None):
+        # fit() runs validation after the training steps; stop the clock here
+        # so the rate covers training only
+        if self.epoch_start is not None and self.train_elapsed is None:
+            self.train_elapsed = time.perf_counter() - self.epoch_start
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = self.train_elapsed
+        if elapsed is None:
+            elapsed = time.perf_counter() - self.epoch_start
+        rate = self.samples_per_epoch / elapsed
+        self.history.append(rate)
+        self.epoch_start = None
+        print(f"Epoch {epoch + 1}: {rate:,.0f} samples/sec ({elapsed:.1f}s training)")
 
 class FlightDelayModel:
     def __init__(self, input_dim):
@@ -18,41 +89,119 @@ class FlightDelayModel:
         reg_output = layers.Dense(1, activation='linear', name='regression')(x)
         
         model = Model(inputs=inputs, outputs=[cls_output, reg_output])
+        self._compile(model, BASE_LEARNING_RATE)
         
+        return model
+
+    def _compile(self, model, learning_rate, jit_compile=False):
         model.compile(
-            optimizer=tf.keras.optimizers.Adam(learning_rate=0.001),
+            optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
             loss={'classification': 'binary_crossentropy', 'regression': 'mae'},
             loss_weights={'classification': 0.7, 'regression': 0.3},
             metrics={
                 'classification': ['accuracy', tf.keras.metrics.AUC(name='auc')],
                 'regression': ['mae', 'mse']
-            }
+            },
+            jit_compile=jit_compile
         )
-        
-        return model
     
-    def train(self, X, y_cls, y_reg, epochs=30, batch_size=256):
+    def train(self, X, y_cls, y_reg, epochs=30, batch_size=256, warmup_epochs=0, jit_compile=False,
+              dtype=np.float32):
+        # dtype=np.float64 reproduces the old per-batch cast, for benchmarking only
+        X = np.asarray(X, dtype=dtype)
+        y_cls = np.asarray(y_cls, dtype=dtype)
+        y_reg = np.asarray(y_reg, dtype=dtype)
+
+        validation_split = 0.2
+        samples_per_epoch = int(len(X) * (1 - validation_split))
+
+        if batch_size != BASE_BATCH_SIZE or warmup_epochs or jit_compile:
+            learning_rate = scaled_learning_rate(batch_size)
+            if warmup_epochs:
+                steps_per_epoch = math.ceil(samples_per_epoch / batch_size)
+                learning_rate = WarmupSchedule(learning_rate, warmup_epochs * steps_per_epoch)
+            self._compile(self.model, learning_rate, jit_compile)
+
         early_stopping = tf.keras.callbacks.EarlyStopping(
             monitor='val_loss',
             patience=5,
             restore_best_weights=True
         )
+        throughput = ThroughputLogger(samples_per_epoch)
         
         self.model.fit(
             X,
             {'classification': y_cls, 'regression': y_reg},
             epochs=epochs,
             batch_size=batch_size,
-            validation_split=0.2,
-            callbacks=[early_stopping],
+            validation_split=validation_split,
+            callbacks=[early_stopping, throughput],
             verbose=1
         )
+        return throughput.history
     
     def predict(self, X):
         return self.model.predict(X, verbose=0)
     
-    def save(self, path='output/model.h5'):
+    def save(self, path='output/model.h5', feature_spec=None, eval_data=None):
         self.model.save(path)
+        if feature_spec is not None:
+            compact_path = os.path.join(os.path.dirname(path), 'compact')
+            self.export_compact(compact_path, feature_spec, eval_data)
+
+    def _dense_layers(self):
+        # Mirrors _build_model: a Dense trunk (Dropout is a no-op at inference)
+        # feeding both output heads.
+        dense_layers = []
+        trunk_output = 'input'
+        for layer in self.model.layers:
+            if not isinstance(layer, layers.Dense):
+                continue
+            kernel, bias = layer.get_weights()
+            dense_layers.append({
+                'name': layer.name,
+                'activation': layer.activation.__name__,
+                'inputs': trunk_output,
+                'kernel': kernel,
+                'bias': bias
+            })
+            if layer.name not in OUTPUT_NAMES:
+                trunk_output = layer.name
+        return dense_layers
+
+    def export_compact(self, path, feature_spec, eval_data=None, variants=artifact.VARIANTS):
+        artifact.write_artifact(self._dense_layers(), OUTPUT_NAMES, feature_spec, path, variants)
+        print(f"Saved compact model to {path}/")
+
+        if eval_data is None:
+            return None
+
+        X_val, y_cls_val, y_reg_val = eval_data
+        reference = self.predict(X_val)
+        ref_auc = roc_auc_score(y_cls_val, reference[0].flatten())
+        ref_mae = mean_absolute_error(y_reg_val, reference[1].flatten())
+
+        print("Quantization report (vs Keras model):")
+        report = {}
+        for variant in variants:
+            compact = artifact.CompactModel(path, variant)
+            preds = compact.predict(X_val)
+            auc = roc_auc_score(y_cls_val, preds[0].flatten())
+            mae = mean_absolute_error(y_reg_val, preds[1].flatten())
+            report[variant] = {
+                'bytes': compact.header['variants'][variant]['bytes'],
+                'auc': float(auc),
+                'mae': float(mae),
+                'auc_delta': float(auc - ref_auc),
+                'mae_delta': float(mae - ref_mae),
+                'max_prob_diff': float(np.max(np.abs(preds[0] - reference[0])))
+            }
+            r = report[variant]
+            print(f" {variant:>7}: {r['bytes']:,} bytes | AUC {auc:.4f} ({r['auc_delta']:+.4f}) | "
+                  f"MAE {mae:.2f} ({r['mae_delta']:+.2f}) | max prob diff {r['max_prob_diff']:.4f}")
+
+        artifact.update_header(path, quantization=report)
+        return report
         
     def load(self, path):
         self.model = models.load_model(path, compile=False)
\ No newline at end of file
@@ -0,0 +1,155 @@
+import itertools
+import joblib
+import numpy as np
+import pandas as pd
+from src.scoring import compute_composite_score
+
+# Precomputed aggregate "cube" over the validation predictions. Every subset of
+# the configured dimensions gets its own table of additive measures (counts and
+# sums), so any slice can be answered by filtering one small table and summing,
+# and the scorecard metrics are derived from those sums afterwards.
+
+DIMENSION_COLUMNS = {
+    'origin': 'Airport',
+    'destination': 'Destination',
+    'airline': 'Airline',
+    'hour': 'Hour',
+    'day_of_week': 'Day_Of_Week'
+}
+DEFAULT_DIMENSIONS = tuple(DIMENSION_COLUMNS)
+NUMERIC_DIMENSIONS = ('hour', 'day_of_week')
+
+COUNT_MEASURES = ('flights', 'delayed', 'on_time', 'tp', 'fp', 'fn')
+SUM_MEASURES = ('sum_delay', 'sum_abs_error', 'sum_pred_prob')
+
+class RollupCube:
+    def __init__(self, dimensions, cuboids):
+        self.dimensions = tuple(dimensions)
+        self.cuboids = cuboids
+
+    @classmethod
+    def build(cls, predictions, dimensions=DEFAULT_DIMENSIONS, max_order=None):
+        unknown = set(dimensions) - set(DIMENSION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown rollup dimensions: {sorted(unknown)}")
+
+        base = pd.DataFrame(index=predictions.index)
+        for dim in dimensions:
+            column = predictions[DIMENSION_COLUMNS[dim]]
+            if dim in NUMERIC_DIMENSIONS:
+                base[dim] = column.astype(np.int8)
+            else:
+                base[dim] = column.astype(str).str.upper().astype('category')
+
+        true_delay = predictions['True_Significant_Delay'].values == 1
+        pred_delay = predictions['Pred_Significant_Delay_Prob'].values > 0.5
+        true_total = predictions['True_Total_Delay'].values
+
+        base['flights'] = 1
+        base['delayed'] = true_delay.astype(np.int32)
+        base['on_time'] = (true_total <= 15).astype(np.int32)
+        base['tp'] = (pred_delay & true_delay).astype(np.int32)
+        base['fp'] = (pred_delay & ~true_delay).astype(np.int32)
+        base['fn'] = (~pred_delay & true_delay).astype(np.int32)
+        base['sum_delay'] = true_total.astype(np.float64)
+        base['sum_abs_error'] = np.abs(true_total - predictions['Pred_Total_Delay'].values)
+        base['sum_pred_prob'] = predictions['Pred_Significant_Delay_Prob'].values.astype(np.float64)
+
+        measures = list(COUNT_MEASURES + SUM_MEASURES)
+        max_order = len(dimensions) if max_order is None else max_order
+
+        cuboids = {}
+        for order in range(max_order + 1):
+            for combo in itertools.combinations(dimensions, order):
+                if combo:
+                    table = base.groupby(list(combo), observed=True, sort=False)[measures].sum().reset_index()
+                else:
+                    table = base[measures].sum().to_frame().T
+                cuboids[combo] = cls._compact(table)
+
+        return cls(dimensions, cuboids)
+
+    @staticmethod
+    def _compact(table):
+        for m in COUNT_MEASURES:
+            table[m] = table[m].astype(np.int32)
+        for m in SUM_MEASURES:
+            table[m] = table[m].astype(np.float32)
+        return table
+
+    def save(self, path):
+        joblib.dump({'dimensions': self.dimensions, 'cuboids': self.cuboids}, path, compress=3)
+
+    @classmethod
+    def load(cls, path):
+        data = joblib.load(path)
+        return cls(data['dimensions'], data['cuboids'])
+
+    def total_rows(self):
+        return sum(len(t) for t in self.cuboids.values())
+
+    def _cuboid_for(self, needed):
+        key = tuple(d for d in self.dimensions if d in needed)
+        if len(key) != len(needed) or key not in self.cuboids:
+            raise ValueError(f"No precomputed rollup covers dimensions {sorted(needed)}")
+        return self.cuboids[key]
+
+    def query(self, filters=None, group_by=(), sort_by='Score', ascending=True, limit=None, min_flights=10):
+        filters = filters or {}
+        group_by = list(group_by)
+        table = self._cuboid_for(set(filters) | set(group_by))
+
+        mask = np.ones(len(table), dtype=bool)
+        for dim, value in filters.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if dim in NUMERIC_DIMENSIONS:
+                values = [int(v) for v in values]
+            else:
+                values = [str(v).upper() for v in values]
+            mask &= table[dim].isin(values).values
+        table = table[mask]
+
+        # Collapses the filtered-but-not-grouped dimensions of the cuboid
+        measures = list(COUNT_MEASURES + SUM_MEASURES)
+        if group_by:
+            table = table.groupby(group_by, observed=True, sort=False)[measures].sum().reset_index()
+        else:
+            table = table[measures].sum().to_frame().T
+
+        table = table[table['flights'] >= max(min_flights, 1)]
+        result = self._derive_metrics(table, group_by)
+
+        if sort_by:
+            if sort_by not in result.columns:
+                raise ValueError(f"Cannot sort by '{sort_by}'")
+            result = result.sort_values(sort_by, ascending=ascending)
+        if limit:
+            result = result.head(limit)
+        return result.reset_index(drop=True)
+
+    @staticmethod
+    def _derive_metrics(table, group_by):
+        flights = table['flights'].values.astype(np.float64)
+        tp = table['tp'].values.astype(np.float64)
+        predicted = tp + table['fp'].values
+        actual = tp + table['fn'].values
+
+        mae = table['sum_abs_error'].values / flights
+        precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+        recall = np.divide(tp, actual, out=np.zeros_like(tp), where=actual > 0)
+        on_time_rate = table['on_time'].values / flights * 100
+
+        result = pd.DataFrame({
+            dim: table[dim].astype(int if dim in NUMERIC_DIMENSIONS else str).values
+            for dim in group_by
+        }, index=range(len(table)))
+        result['Score'] = np.round(compute_composite_score(mae, precision, recall, on_time_rate), 1)
+        result['Avg_Delay'] = np.round(table['sum_delay'].values / flights, 1)
+        result['Delay_Rate'] = np.round(table['delayed'].values / flights * 100, 1)
+        result['Pred_Delay_Prob'] = np.round(table['sum_pred_prob'].values / flights * 100, 1)
+        result['OnTime_Rate'] = np.round(on_time_rate, 1)
+        result['MAE'] = np.round(mae, 1)
+        result['Precision'] = np.round(precision * 100, 1)
+        result['Recall'] = np.round(recall * 100, 1)
+        result['Flights'] = table['flights'].values.astype(int)
+        return result
@@ -1,12 +1,21 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 import time
+from src.scoring import compute_composite_score
 
-def create_scorecard_dataframe(airports_val, y_cls_val, y_reg_val, cls_predictions, reg_predictions):
-    print(f"\n[6/6] Creating scorecard and visualizations...")
+SCORECARD_COLUMNS = [
+    'Airport', 'Score', 'Avg_Delay', 'Delay_Rate', 'OnTime_Rate',
+    'MAE', 'Precision', 'Recall', 'Flights'
+]
+
+def create_scorecard_dataframe(airports_val, y_cls_val, y_reg_val, cls_predictions, reg_predictions, verbose=True):
+    if verbose:
+        print(f"\n[6/6] Creating scorecard and visualizations...")
     
     scorecard_data = []
     unique_airports = np.unique(airports_val)
@@ -35,17 +44,7 @@ def create_scorecard_dataframe(airports_val, y_cls_val, y_reg_val, cls_predictio
         delay_rate = np.mean(airport_true_cls) * 100
         on_time_rate = np.mean(airport_true_reg <= 15) * 100
 
-        mae_score = max(0, 100 - (mae_airport * 2))
-        precision_score = precision * 100
-        tpr_score = tpr * 100
-        on_time_score = on_time_rate
-        
-        composite_score = (
-            0.3 * mae_score +
-            0.2 * precision_score +
-            0.2 * tpr_score +
-            0.3 * on_time_score
-        )
+        composite_score = compute_composite_score(mae_airport, precision, tpr, on_time_rate)
 
         scorecard_data.append({
             'Airport': airport,
@@ -59,16 +58,21 @@ def create_scorecard_dataframe(airports_val, y_cls_val, y_reg_val, cls_predictio
             'Flights': mask.sum()
         })
 
-    scorecard_df = pd.DataFrame(scorecard_data)
+    scorecard_df = pd.DataFrame(scorecard_data, columns=SCORECARD_COLUMNS)
     scorecard_df = scorecard_df.sort_values('Score', ascending=False)
     return scorecard_df
 
 def save_visualizations(scorecard_df, output_dir='output'):
+    path = os.path.join(output_dir, 'scorecard_visualization.png')
+    render_scorecard_figure(scorecard_df, path)
+    print(f"Saved visualization to {output_dir}/scorecard_visualization.png")
+
+def render_scorecard_figure(scorecard_df, path, title='Airport Performance Analysis - Neural Network Model', dpi=150, format='png'):
     plt.style.use('seaborn-v0_8-darkgrid')
     sns.set_palette("husl")
 
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-    fig.suptitle('Airport Performance Analysis - Neural Network Model', fontsize=16, fontweight='bold')
+    fig.suptitle(title, fontsize=16, fontweight='bold')
 
     top_airports = scorecard_df.head(15)
     axes[0, 0].barh(top_airports['Airport'], top_airports['Score'])
@@ -108,10 +112,11 @@ def save_visualizations(scorecard_df, output_dir='output'):
     axes[1, 1].set_ylabel('Actual On-Time Rate (%)')
     axes[1, 1].set_title('Model Accuracy vs Actual Performance')
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'scorecard_visualization.png'), dpi=150, bbox_inches='tight')
-    plt.close()
-    print(f"Saved visualization to {output_dir}/scorecard_visualization.png")
+    try:
+        plt.tight_layout()
+        plt.savefig(path, dpi=dpi, bbox_inches='tight', format=format)
+    finally:
+        plt.close(fig)
 
 def save_summary(scorecard_df, auc, mae, original_count, model_count, output_dir='output'):
     with open(os.path.join(output_dir, 'summary.txt'), 'w') as f:
@@ -0,0 +1,18 @@
+import numpy as np
+
+# Kept free of plotting imports so the Flask process can score rollups
+# without loading matplotlib/seaborn.
+
+def compute_composite_score(mae, precision, tpr, on_time_rate):
+    # Works on scalars or arrays so rollups can score whole tables at once
+    mae_score = np.maximum(0, 100 - (mae * 2))
+    precision_score = precision * 100
+    tpr_score = tpr * 100
+    on_time_score = on_time_rate
+
+    return (
+        0.3 * mae_score +
+        0.2 * precision_score +
+        0.2 * tpr_score +
+        0.3 * on_time_score
+    )
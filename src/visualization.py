@@ -0,0 +1,195 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Parameterized scorecard charts rendered outside the Flask request thread.
+# Workers are spawned (not forked from the threaded server) and import
+# src.scorecard, which pins matplotlib to the Agg backend. PNGs are cached on
+# disk under a key built from the scorecard version and the chart parameters;
+# charts from an older version are deleted once a retrain is noticed, and the
+# cache is capped at MAX_CACHED_CHARTS files.
+
+MIN_DPI = 50
+MAX_DPI = 200
+MAX_CACHED_CHARTS = 200
+
+def normalize_params(airline=None, airports=None, dpi=100):
+    airline = str(airline).strip().upper() if airline else None
+    if airports:
+        if isinstance(airports, str):
+            airports = airports.split(',')
+        airports = sorted({a.strip().upper() for a in airports if a.strip()}) or None
+    else:
+        airports = None
+    dpi = min(max(int(dpi), MIN_DPI), MAX_DPI)
+    return {'airline': airline, 'airports': airports, 'dpi': dpi}
+
+# Per-worker-process cache of the rollup cube, reloaded when the file changes
+_worker_rollups = {'mtime': None, 'cube': None}
+
+def _load_rollups(output_dir):
+    from src.rollups import RollupCube
+
+    path = os.path.join(output_dir, 'rollups.pkl')
+    if not os.path.exists(path):
+        raise ValueError("Rollups not found. Re-run main.py.")
+    mtime = os.stat(path).st_mtime_ns
+    if _worker_rollups['mtime'] != mtime:
+        _worker_rollups['cube'] = RollupCube.load(path)
+        _worker_rollups['mtime'] = mtime
+    return _worker_rollups['cube']
+
+def render_chart(params, output_dir, path):
+    import pandas as pd
+    from src import scorecard
+
+    if params['airline']:
+        # Same metrics as create_scorecard_dataframe, from the precomputed
+        # (origin, airline) rollup instead of rescanning predictions.csv
+        scorecard_df = _load_rollups(output_dir).query(
+            filters={'airline': params['airline']},
+            group_by=['origin'],
+            sort_by='Score',
+            ascending=False,
+            min_flights=10
+        ).rename(columns={'origin': 'Airport'})
+        if scorecard_df.empty:
+            raise ValueError(f"No airport has at least 10 flights for airline {params['airline']}")
+    else:
+        scorecard_df = pd.read_csv(os.path.join(output_dir, 'airport_scorecard.csv'))
+
+    if params['airports'] and not scorecard_df.empty:
+        scorecard_df = scorecard_df[scorecard_df['Airport'].isin(params['airports'])]
+    if scorecard_df.empty:
+        raise ValueError("No airports match the requested filters")
+
+    title = 'Airport Performance Analysis'
+    if params['airline']:
+        title += f" - {params['airline']}"
+    if params['airports']:
+        title += f" ({', '.join(params['airports'][:8])}{'...' if len(params['airports']) > 8 else ''})"
+
+    # Write then rename so readers never see a half-written PNG
+    tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.png"
+    try:
+        scorecard.render_scorecard_figure(scorecard_df, tmp_path, title=title, dpi=params['dpi'], format='png')
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+class VisualizationService:
+    def __init__(self, output_dir='output', max_workers=2):
+        self.output_dir = output_dir
+        self.cache_dir = os.path.join(output_dir, 'charts')
+        self.max_workers = max_workers
+        self.executor = None
+        self.pending = {}
+        self.errors = {}
+        self.cached_version = None
+        # Re-entrant: a done-callback runs inline if the future already finished
+        self.lock = threading.RLock()
+
+    def _get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self.executor
+
+    def scorecard_version(self):
+        parts = []
+        for name in ('airport_scorecard.csv', 'rollups.pkl'):
+            path = os.path.join(self.output_dir, name)
+            if os.path.exists(path):
+                stat = os.stat(path)
+                parts.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+        return '|'.join(parts)
+
+    def cache_key(self, params, version_tag):
+        payload = json.dumps(params, sort_keys=True)
+        return f"{version_tag}_{hashlib.sha1(payload.encode()).hexdigest()[:20]}"
+
+    def _prune(self, version_tag):
+        if not os.path.isdir(self.cache_dir):
+            return
+        charts = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.startswith(f"{version_tag}_"):
+                self._remove(path)
+            elif name.endswith('.png') and '.tmp.' not in name:
+                charts.append(path)
+
+        charts.sort(key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+        for path in charts[:max(len(charts) - MAX_CACHED_CHARTS, 0)]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _submit(self, params, key):
+        try:
+            return self._get_executor().submit(render_chart, params, self.output_dir, self.chart_path(key))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool once
+            self.shutdown()
+            return self._get_executor().submit(render_chart, params, self.output_dir, self.chart_path(key))
+
+    def chart_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.png')
+
+    def request_chart(self, params):
+        """Returns (status, key, error); status is 'ready', 'pending' or 'error'."""
+        version_tag = hashlib.sha1(self.scorecard_version().encode()).hexdigest()[:10]
+        key = self.cache_key(params, version_tag)
+        if os.path.exists(self.chart_path(key)):
+            return 'ready', key, None
+
+        with self.lock:
+            if version_tag != self.cached_version:
+                self._prune(version_tag)
+                self.cached_version = version_tag
+            if os.path.exists(self.chart_path(key)):
+                return 'ready', key, None
+            if key in self.errors:
+                return 'error', key, self.errors.pop(key)
+            if key not in self.pending:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                try:
+                    future = self._submit(params, key)
+                except BrokenProcessPool as e:
+                    self.shutdown()
+                    return 'error', key, f"Chart renderer unavailable: {e}"
+                self.pending[key] = future
+                future.add_done_callback(lambda f, key=key: self._on_done(key, f))
+        return 'pending', key, None
+
+    def _on_done(self, key, future):
+        with self.lock:
+            self.pending.pop(key, None)
+            if future.cancelled():
+                return
+            exc = future.exception()
+            if exc is not None:
+                self.errors[key] = str(exc) or type(exc).__name__
+            else:
+                self._prune(self.cached_version)
+
+    def shutdown(self):
+        if self.executor is not None:
+            try:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+            except BrokenProcessPool:
+                pass
+            self.executor = None